@@ -2,8 +2,9 @@
 API endpoints for article submission and management
 """
 import time
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -17,6 +18,8 @@ from utils.error_handlers import (
     handle_generic_error,
     safe_execute,
     create_error_response,
+    json_body_openapi,
+    parse_json_body,
     ArticleServiceError
 )
 from utils.security import InvalidInputError
@@ -28,9 +31,29 @@ logger = get_logger(__name__)
 # Create router for article endpoints
 router = APIRouter(prefix="/api/articles", tags=["articles"])
 
-@router.post("/submit")
+class PendingArticlesJSONResponse(Response):
+    """Renders a PendingArticlesResponse to JSON bytes one article at a time"""
+    media_type = "application/json"
+    
+    def render(self, content: PendingArticlesResponse) -> bytes:
+        articles = b",".join(
+            orjson.dumps({
+                "id": article.id,
+                "url": article.url,
+                "submitted_by": article.submitted_by,
+                "timestamp": article.timestamp
+            })
+            for article in content.articles
+        )
+        return b'{"success":%s,"count":%d,"articles":[%s]}' % (
+            b"true" if content.success else b"false",
+            content.count,
+            articles
+        )
+
+@router.post("/submit", openapi_extra=json_body_openapi(ArticleSubmission))
 async def submit_article(
-    submission: ArticleSubmission,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -38,6 +61,7 @@ async def submit_article(
     Routes to manual_input_articles if domain is in manual sites list, otherwise to pending_articles
     """
     start_time = time.time()
+    submission = await parse_json_body(request, ArticleSubmission)
     
     try:
         from models import Article, ManualInputArticle
@@ -126,7 +150,7 @@ async def submit_article(
             "error_type": type(e).__name__
         }
 
-@router.get("/pending")
+@router.get("/pending", response_class=PendingArticlesJSONResponse)
 async def get_pending_articles(
     db: Session = Depends(get_db)
 ):
@@ -140,37 +164,23 @@ async def get_pending_articles(
         JSON response with list of pending articles
     """
     try:
-        from models import Article
-        
         # Query all pending articles
-        pending_articles = db.query(Article).order_by(Article.timestamp.desc()).all()
+        articles = ArticleService(db).get_pending_articles()
         
-        # Convert to list of dictionaries
-        articles_list = []
-        for article in pending_articles:
-            articles_list.append({
-                "id": article.id,
-                "url": article.url,
-                "submitted_by": article.submitted_by,
-                "timestamp": article.timestamp.isoformat()
-            })
+        logger.info(f"Retrieved {len(articles)} pending articles")
         
-        logger.info(f"Retrieved {len(articles_list)} pending articles")
-        
-        return {
-            "success": True,
-            "articles": articles_list,
-            "count": len(articles_list)
-        }
+        return PendingArticlesJSONResponse(
+            PendingArticlesResponse(articles=articles, count=len(articles))
+        )
         
     except Exception as e:
         logger.error(f"Error retrieving pending articles: {e}")
-        return {
+        return JSONResponse({
             "success": False,
             "error": str(e),
             "articles": [],
             "count": 0
-        }
+        })
 
 @router.post("/process/{article_id}")
 async def process_article(
@@ -18,6 +18,8 @@ from utils.error_handlers import (
     handle_generic_error,
     safe_execute,
     create_error_response,
+    json_body_openapi,
+    parse_json_body,
     ReportServiceError
 )
 from utils.security import InvalidInputError
@@ -172,9 +174,13 @@ async def generate_hansard_report_async(report_id: str, recipient_email: str, db
             duration_ms=duration_ms
         )
 
-@router.post("/media", response_model=ReportResponse, status_code=status.HTTP_202_ACCEPTED)
+@router.post(
+    "/media",
+    response_model=ReportResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=json_body_openapi(MediaReportRequest)
+)
 async def generate_media_report(
-    report_request: MediaReportRequest,
     request: Request,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -183,8 +189,7 @@ async def generate_media_report(
     Generate a comprehensive media report from pending articles and pasted content
     
     Args:
-        report_request: MediaReportRequest with pasted content
-        request: FastAPI request object for tracking
+        request: FastAPI request object carrying the MediaReportRequest JSON body
         background_tasks: FastAPI background tasks for async processing
         db: Database session dependency
         
@@ -196,6 +201,7 @@ async def generate_media_report(
     """
     start_time = time.time()
     request_id = getattr(request.state, 'request_id', None)
+    report_request = await parse_json_body(request, MediaReportRequest)
     
     def start_media_report_operation():
         try:
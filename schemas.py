@@ -1,34 +1,116 @@
-from pydantic import BaseModel, validator
-from typing import List, Optional
-from datetime import datetime
+from pydantic import (
+    BaseModel, StringConstraints, TypeAdapter, ValidationError,
+    computed_field, field_validator, model_validator, validator
+)
+from typing import Annotated, List, Optional
+from datetime import datetime, timedelta, timezone
 
 from utils.security import validate_and_sanitize_url, validate_and_sanitize_name, validate_and_sanitize_text
 
+MAX_NAME_LENGTH = 100
+MAX_PASTED_CONTENT_LENGTH = 100000
+
+# Whitespace stripping and length limits are enforced by pydantic-core
+SubmitterName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=MAX_NAME_LENGTH)]
+PastedContent = Annotated[str, StringConstraints(strip_whitespace=True, max_length=MAX_PASTED_CONTENT_LENGTH)]
+
+def _apply_string_constraints(value, handler, field_name: str, max_length: int):
+    """Run the field's string constraints, reporting length failures in the API's wording"""
+    try:
+        return handler(value)
+    except ValidationError as e:
+        error_type = e.errors()[0]['type']
+        if error_type == 'string_too_short':
+            raise ValueError(f'{field_name} cannot be empty') from None
+        if error_type == 'string_too_long':
+            raise ValueError(f'{field_name} exceeds maximum length of {max_length} characters') from None
+        raise
+
 class ArticleSubmission(BaseModel):
     """Model for article submission requests"""
     url: str
-    submitted_by: str
+    submitted_by: SubmitterName
     
-    @validator('submitted_by')
-    def validate_submitted_by(cls, v):
-        # Use security utility for name validation
-        return validate_and_sanitize_name(v, max_length=100)
+    @field_validator('submitted_by', mode='wrap')
+    @classmethod
+    def validate_submitted_by(cls, v, handler):
+        v = _apply_string_constraints(v, handler, 'submitted_by', MAX_NAME_LENGTH)
+        # Use security utility for character checks and escaping
+        return validate_and_sanitize_name(v, max_length=MAX_NAME_LENGTH)
     
     @validator('url')
     def validate_url(cls, v):
+        # Malformed input is a field error; policy rejections come from the security utility
+        if not v.strip().lower().startswith(('http://', 'https://')):
+            raise ValueError('URL must be an absolute http or https URL')
         # Use security utility for URL validation and sanitization
-        return validate_and_sanitize_url(str(v))
+        return validate_and_sanitize_url(v)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
+def datetime_to_ns(value: datetime) -> int:
+    """Convert a datetime to integer nanoseconds since the epoch (naive values are treated as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
 
 class Article(BaseModel):
     """Model for article data"""
     id: Optional[int] = None
     url: str
     pasted_text: Optional[str] = None
-    timestamp: datetime
+    timestamp_ns: int
     submitted_by: str
     
     class Config:
         from_attributes = True
+    
+    @model_validator(mode='before')
+    @classmethod
+    def convert_timestamp(cls, data):
+        # Accept any datetime-like value under the public 'timestamp' name, from dicts or attribute objects
+        if isinstance(data, dict):
+            if 'timestamp_ns' in data or 'timestamp' not in data:
+                return data
+            data = dict(data)
+            value = data.pop('timestamp')
+        elif hasattr(data, 'timestamp') and not hasattr(data, 'timestamp_ns'):
+            value = data.timestamp
+            data = {
+                name: getattr(data, name)
+                for name in cls.model_fields
+                if name != 'timestamp_ns' and hasattr(data, name)
+            }
+        else:
+            return data
+        
+        try:
+            timestamp = _DATETIME_ADAPTER.validate_python(value)
+        except ValidationError as e:
+            raise ValueError(f"Invalid timestamp: {e.errors()[0]['msg']}") from None
+        data['timestamp_ns'] = datetime_to_ns(timestamp)
+        return data
+    
+    @computed_field
+    @property
+    def timestamp(self) -> datetime:
+        return _EPOCH + timedelta(microseconds=self.timestamp_ns // 1000)
+    
+    @classmethod
+    def from_row(cls, row) -> "Article":
+        """Build an Article from a trusted database row without re-validating it"""
+        if row.timestamp is None:
+            # Incomplete rows go through full validation, which rejects the missing timestamp
+            return cls.model_validate(row)
+        return cls.model_construct(
+            id=row.id,
+            url=row.url,
+            pasted_text=row.pasted_text,
+            timestamp_ns=datetime_to_ns(row.timestamp),
+            submitted_by=row.submitted_by
+        )
 
 class ArticleResponse(BaseModel):
     """Model for article API responses"""
@@ -38,6 +120,7 @@ class ArticleResponse(BaseModel):
 
 class PendingArticlesResponse(BaseModel):
     """Model for pending articles list response"""
+    success: bool = True
     articles: List[Article]
     count: int
 
@@ -51,13 +134,18 @@ class ManualArticleBatchPayload(BaseModel):
 
 class MediaReportRequest(BaseModel):
     """Model for media report generation requests"""
-    pasted_content: str
+    pasted_content: PastedContent
     recipient_email: str
     
-    @validator('pasted_content')
-    def validate_pasted_content(cls, v):
-        # Use security utility for text validation and sanitization
-        return validate_and_sanitize_text(v, max_length=100000)
+    @field_validator('pasted_content', mode='wrap')
+    @classmethod
+    def validate_pasted_content(cls, v, handler):
+        # Reject oversized input before pydantic-core copies it while stripping whitespace
+        if isinstance(v, (str, bytes)) and len(v) > MAX_PASTED_CONTENT_LENGTH:
+            raise ValueError(f'pasted_content exceeds maximum length of {MAX_PASTED_CONTENT_LENGTH} characters')
+        v = _apply_string_constraints(v, handler, 'pasted_content', MAX_PASTED_CONTENT_LENGTH)
+        # Use security utility for text sanitization
+        return validate_and_sanitize_text(v, max_length=MAX_PASTED_CONTENT_LENGTH)
     
     @validator('recipient_email')
     def validate_recipient_email(cls, v):
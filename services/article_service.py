@@ -9,7 +9,7 @@ from datetime import datetime
 
 from database import get_db
 from models import Article, ManualInputArticle, ProcessedArchive
-from schemas import ArticleSubmission, ManualArticleUpdate
+from schemas import ArticleSubmission, ManualArticleUpdate, Article as ArticleSchema
 from utils.logging_config import get_logger, log_operation, log_error
 from utils.error_handlers import ArticleServiceError, DatabaseError
 
@@ -21,7 +21,7 @@ class ArticleService:
     def __init__(self, db: Session):
         self.db = db
     
-    def submit_article(self, submission: ArticleSubmission) -> Tuple[bool, str, Optional[Article]]:
+    def submit_article(self, submission: ArticleSubmission) -> Tuple[bool, str, Optional[ArticleSchema]]:
         """
         Submit a new article for processing
         
@@ -80,13 +80,7 @@ class ArticleService:
             self.db.refresh(new_article)
             
             # Convert to Pydantic model
-            article = Article(
-                id=new_article.id,
-                url=new_article.url,
-                pasted_text=new_article.pasted_text,
-                timestamp=new_article.timestamp,
-                submitted_by=new_article.submitted_by
-            )
+            article = ArticleSchema.from_row(new_article)
             
             duration_ms = (time.time() - start_time) * 1000
             log_operation(
@@ -115,7 +109,7 @@ class ArticleService:
             log_error(logger, e, operation="submit_article", url=submission.url)
             raise ArticleServiceError("Failed to submit article", "ARTICLE_SUBMISSION_FAILED")
     
-    def get_pending_articles(self) -> List[Article]:
+    def get_pending_articles(self) -> List[ArticleSchema]:
         """
         Retrieve all pending articles
         
@@ -130,15 +124,7 @@ class ArticleService:
             ).all()
             
             # Convert to Pydantic models
-            articles = []
-            for article in pending_articles:
-                articles.append(Article(
-                    id=article.id,
-                    url=article.url,
-                    pasted_text=article.pasted_text,
-                    timestamp=article.timestamp,
-                    submitted_by=article.submitted_by
-                ))
+            articles = [ArticleSchema.from_row(article) for article in pending_articles]
             
             duration_ms = (time.time() - start_time) * 1000
             log_operation(
@@ -158,7 +144,7 @@ class ArticleService:
             log_error(logger, e, operation="get_pending_articles")
             raise ArticleServiceError("Failed to retrieve pending articles", "ARTICLE_RETRIEVAL_FAILED")
     
-    def get_pending_article_by_id(self, article_id: int) -> Optional[Article]:
+    def get_pending_article_by_id(self, article_id: int) -> Optional[ArticleSchema]:
         """
         Retrieve a specific pending article by ID
         
@@ -176,13 +162,7 @@ class ArticleService:
             if not article:
                 return None
             
-            return Article(
-                id=article.id,
-                url=article.url,
-                pasted_text=article.pasted_text,
-                timestamp=article.timestamp,
-                submitted_by=article.submitted_by
-            )
+            return ArticleSchema.from_row(article)
             
         except Exception as e:
             logger.error(f"Error retrieving article {article_id}: {e}")
@@ -5,19 +5,60 @@ This service provides robust content extraction using newspaper3k and BeautifulS
 with proper error handling, timeout management, and content validation.
 """
 
+import asyncio
 import logging
+import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional, Tuple
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse
+from collections import OrderedDict
 import time
 from newspaper import Article
 from bs4 import BeautifulSoup
 import re
 
+# Optional imports
+try:
+    import lxml  # noqa: F401 - C parser backend for BeautifulSoup
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 from config import settings
+from utils.dns_cache import cached_resolution
 
 logger = logging.getLogger(__name__)
 
+# lxml parses many times faster than the pure-Python html.parser; fall back if it is missing
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# Maximum number of URLs whose validators and parsed content are kept for conditional GETs
+CONDITIONAL_CACHE_SIZE = 512
+
+# Streamed HTML is read in chunks of this size and cut off past the maximum
+HTML_CHUNK_SIZE = 64 * 1024
+MAX_HTML_BYTES = 10 * 1024 * 1024
+
+# Retry back-off: retry_delay doubles per attempt, plus up to this much random jitter, capped
+RETRY_JITTER_SECONDS = 0.1
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+# Successful scrape results are reused for repeat URLs within this many seconds
+SCRAPE_CACHE_TTL_SECONDS = 600
+SCRAPE_CACHE_SIZE = 1024
+
+# One keep-alive connection pool shared by every ScrapingService, so repeated
+# scrapes of the same host skip the TCP/TLS handshake. Retries are handled by
+# scrape_article itself, hence max_retries=0 on the adapter.
+_SHARED_SESSION = requests.Session()
+_SHARED_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+for _scheme in ('http://', 'https://'):
+    _SHARED_SESSION.mount(_scheme, HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=0))
+
 
 class ScrapingError(Exception):
     """Custom exception for scraping-related errors."""
@@ -27,7 +68,8 @@ class ScrapingError(Exception):
 class ScrapingService:
     """Service for scraping article content from web URLs."""
     
-    def __init__(self, timeout: int = 30, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(self, timeout: int = 30, max_retries: int = 3, retry_delay: float = 1.0,
+                 max_concurrency: int = 8):
         """
         Initialize the scraping service.
         
@@ -35,16 +77,22 @@ class ScrapingService:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             retry_delay: Delay between retries in seconds
+            max_concurrency: Maximum number of URLs scraped at once in a batch
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.session = requests.Session()
+        self.max_concurrency = max_concurrency
+        # Shared session carries the user agent and pooled keep-alive connections
+        self.session = _SHARED_SESSION
         
-        # Set user agent to avoid blocking
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # URL -> (ETag, Last-Modified, parsed result) for conditional re-fetches
+        self._conditional_cache: "OrderedDict[str, Tuple[Optional[str], Optional[str], Dict[str, str]]]" = OrderedDict()
+        self._conditional_cache_lock = threading.Lock()
+        
+        # Normalized URL -> (successful scrape result, monotonic expiry time)
+        self._scrape_cache: "OrderedDict[str, Tuple[Dict[str, any], float]]" = OrderedDict()
+        self._scrape_cache_lock = threading.Lock()
     
     def _validate_url(self, url: str) -> bool:
         """
@@ -95,7 +143,9 @@ class ScrapingService:
         """
         try:
             article = Article(url)
-            article.download()
+            # Avoid a resolver round-trip for every request to an already-seen host
+            with cached_resolution():
+                article.download()
             article.parse()
             
             if not article.text or len(article.text.strip()) < 50:
@@ -111,6 +161,27 @@ class ScrapingService:
             logger.debug(f"Newspaper3k extraction failed for {url}: {str(e)}")
             return None
     
+    def _read_html(self, url: str, response: requests.Response) -> bytes:
+        """
+        Read a streamed response body, stopping once MAX_HTML_BYTES have arrived.
+        
+        Args:
+            url: URL being fetched (for logging)
+            response: Response opened with stream=True
+            
+        Returns:
+            Raw (possibly truncated) HTML bytes
+        """
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=HTML_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_HTML_BYTES:
+                logger.warning(f"Truncating {url} after {MAX_HTML_BYTES} bytes")
+                break
+        return b''.join(chunks)
+    
     def _extract_with_beautifulsoup(self, url: str) -> Optional[Dict[str, str]]:
         """
         Extract content using BeautifulSoup as fallback method.
@@ -122,10 +193,31 @@ class ScrapingService:
             Dictionary with title and text, or None if extraction fails
         """
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            with self._conditional_cache_lock:
+                cached = self._conditional_cache.get(url)
+            
+            # Revalidate a previously parsed page instead of downloading it again
+            headers = {}
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            # Stream the body so oversized pages are cut off instead of buffered whole
+            with cached_resolution():
+                response = self.session.get(url, timeout=self.timeout, headers=headers, stream=True)
+            try:
+                if cached and response.status_code == 304:
+                    logger.debug(f"Content not modified, reusing parsed result for {url}")
+                    return dict(cached[2])
+                response.raise_for_status()
+                html_bytes = self._read_html(url, response)
+            finally:
+                response.close()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html_bytes, HTML_PARSER)
             
             # Remove script and style elements
             for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
@@ -164,22 +256,78 @@ class ScrapingService:
             if not text or len(text.strip()) < 50:
                 return None
             
-            return {
+            result = {
                 'title': self._clean_text(title),
                 'text': self._clean_text(text),
                 'authors': [],
                 'publish_date': None
             }
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                with self._conditional_cache_lock:
+                    self._conditional_cache[url] = (etag, last_modified, result)
+                    self._conditional_cache.move_to_end(url)
+                    while len(self._conditional_cache) > CONDITIONAL_CACHE_SIZE:
+                        self._conditional_cache.popitem(last=False)
+            
+            return dict(result)
         except Exception as e:
             logger.debug(f"BeautifulSoup extraction failed for {url}: {str(e)}")
             return None
     
-    def scrape_article(self, url: str) -> Dict[str, any]:
+    def _cache_key(self, url: str) -> str:
+        """
+        Normalize a URL for the scrape cache: lowercase scheme and host, no fragment.
+        
+        Args:
+            url: URL to normalize
+            
+        Returns:
+            Cache key for the URL
+        """
+        parsed = urlparse(url)
+        return urlunparse((
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path,
+            parsed.params,
+            parsed.query,
+            ''
+        ))
+    
+    def _get_cached_scrape(self, key: str) -> Optional[Dict[str, any]]:
+        """Return an unexpired cached scrape result for the key, if any."""
+        with self._scrape_cache_lock:
+            entry = self._scrape_cache.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._scrape_cache[key]
+                return None
+            self._scrape_cache.move_to_end(key)
+        return result
+    
+    def _store_cached_scrape(self, key: str, result: Dict[str, any]) -> None:
+        """Remember a successful scrape result, evicting the least recently used."""
+        with self._scrape_cache_lock:
+            self._scrape_cache[key] = (dict(result, authors=list(result['authors'])), time.monotonic() + SCRAPE_CACHE_TTL_SECONDS)
+            self._scrape_cache.move_to_end(key)
+            while len(self._scrape_cache) > SCRAPE_CACHE_SIZE:
+                self._scrape_cache.popitem(last=False)
+    
+    def scrape_article(self, url: str, refresh: bool = False) -> Dict[str, any]:
         """
         Scrape content from a single article URL.
         
+        Successful results are cached for SCRAPE_CACHE_TTL_SECONDS, keyed by
+        normalized URL, so repeat requests skip download and extraction.
+        
         Args:
             url: URL to scrape
+            refresh: Ignore any cached result and scrape again
             
         Returns:
             Dictionary containing:
@@ -220,6 +368,13 @@ class ScrapingService:
             logger.warning(f"Invalid URL format: {url}")
             return result
         
+        cache_key = self._cache_key(url)
+        if not refresh:
+            cached = self._get_cached_scrape(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached content for {url}")
+                return dict(cached, url=url, authors=list(cached['authors']))
+        
         # Try scraping with retries
         last_error = None
         for attempt in range(self.max_retries):
@@ -235,6 +390,7 @@ class ScrapingService:
                     result.update(content)
                     result['success'] = True
                     logger.info(f"Successfully scraped content from {url}")
+                    self._store_cached_scrape(cache_key, result)
                     return result
                 else:
                     last_error = "No content could be extracted"
@@ -255,9 +411,10 @@ class ScrapingService:
                 last_error = f"Unexpected error: {str(e)}"
                 logger.error(f"Unexpected error scraping {url}: {str(e)}")
             
-            # Wait before retry (except on last attempt)
+            # Wait before retry (except on last attempt), backing off exponentially with jitter
             if attempt < self.max_retries - 1:
-                time.sleep(self.retry_delay)
+                delay = self.retry_delay * (2 ** attempt) + random.uniform(0, RETRY_JITTER_SECONDS)
+                time.sleep(min(delay, MAX_RETRY_DELAY_SECONDS))
         
         result['error'] = last_error
         logger.error(f"Failed to scrape {url} after {self.max_retries} attempts: {last_error}")
@@ -298,35 +455,54 @@ class ScrapingService:
         else:
             return False, {}, result.get('error', 'Unknown error')
     
-    def batch_scrape(self, urls: List[str]) -> List[Dict[str, any]]:
+    async def batch_scrape_async(self, urls: List[str]) -> List[Dict[str, any]]:
         """
-        Scrape content from multiple URLs.
+        Scrape content from multiple URLs concurrently.
+        
+        Each URL is scraped in a worker thread, with at most max_concurrency
+        requests in flight at once.
         
         Args:
             urls: List of URLs to scrape
             
         Returns:
-            List of scraping results, one for each URL
+            List of scraping results, in the same order as the URLs
         """
         if not urls:
             return []
         
         logger.info(f"Starting batch scrape of {len(urls)} URLs")
-        results = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        for i, url in enumerate(urls, 1):
-            logger.info(f"Scraping URL {i}/{len(urls)}: {url}")
-            result = self.scrape_article(url)
-            results.append(result)
-            
-            # Small delay between requests to be respectful
-            if i < len(urls):
-                time.sleep(0.5)
+        async def scrape_one(i: int, url: str) -> Dict[str, any]:
+            async with semaphore:
+                logger.info(f"Scraping URL {i}/{len(urls)}: {url}")
+                return await asyncio.to_thread(self.scrape_article, url)
+        
+        results = await asyncio.gather(*(scrape_one(i, url) for i, url in enumerate(urls, 1)))
         
         successful = sum(1 for r in results if r['success'])
         logger.info(f"Batch scrape completed: {successful}/{len(urls)} successful")
         
-        return results
+        return list(results)
+    
+    def batch_scrape(self, urls: List[str]) -> List[Dict[str, any]]:
+        """
+        Scrape content from multiple URLs.
+        
+        Synchronous wrapper around batch_scrape_async; must not be called
+        from inside a running event loop.
+        
+        Args:
+            urls: List of URLs to scrape
+            
+        Returns:
+            List of scraping results, one for each URL
+        """
+        if not urls:
+            return []
+        
+        return asyncio.run(self.batch_scrape_async(urls))
 
 
 # Global instance for easy import
@@ -0,0 +1,11 @@
+"""
+Shared pytest configuration for the test suite
+"""
+
+
+def pytest_configure(config):
+    """Register custom markers"""
+    config.addinivalue_line(
+        "markers",
+        "integration: end-to-end workflow tests; deselect with -m 'not integration' for quicker local runs"
+    )
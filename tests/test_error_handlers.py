@@ -1,7 +1,10 @@
 """
 Tests for error handling utilities
 """
+import asyncio
 import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
 from fastapi import HTTPException, status
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
@@ -22,8 +25,10 @@ from utils.error_handlers import (
     handle_validation_error,
     handle_service_error,
     handle_generic_error,
-    safe_execute
+    safe_execute,
+    parse_json_body
 )
+from schemas import ArticleSubmission
 
 class TestMediaMonitoringError:
     """Test custom exception classes"""
@@ -247,4 +252,53 @@ class TestSafeExecute:
             return f"Custom: {str(error)}"
         
         result = safe_execute(test_func, error_handler=custom_handler)
-        assert result == "Custom: Test error"
\ No newline at end of file
+        assert result == "Custom: Test error"
+
+class TestParseJsonBody:
+    """Test raw JSON body parsing and validation"""
+    
+    @staticmethod
+    def _request(body: bytes):
+        request = Mock()
+        request.state = SimpleNamespace(request_id="req-1")
+        
+        async def read_body():
+            return body
+        
+        request.body = read_body
+        return request
+    
+    def test_parse_json_body_success(self):
+        """Test valid body is parsed into the model"""
+        request = self._request(b'{"url": "https://example.com/article", "submitted_by": "Test User"}')
+        
+        submission = asyncio.run(parse_json_body(request, ArticleSubmission))
+        
+        assert submission.url == "https://example.com/article"
+        assert submission.submitted_by == "Test User"
+    
+    def test_parse_json_body_validation_error(self):
+        """Test invalid fields raise RequestValidationError with body locations"""
+        request = self._request(b'{"url": "not-a-valid-url", "submitted_by": "Test User"}')
+        
+        with pytest.raises(RequestValidationError) as exc_info:
+            asyncio.run(parse_json_body(request, ArticleSubmission))
+        
+        assert exc_info.value.errors()[0]["loc"] == ("body", "url")
+    
+    def test_parse_json_body_invalid_json(self):
+        """Test malformed JSON raises RequestValidationError"""
+        request = self._request(b'{not json')
+        
+        with pytest.raises(RequestValidationError):
+            asyncio.run(parse_json_body(request, ArticleSubmission))
+    
+    def test_parse_json_body_security_rejection(self):
+        """Test security check failures become 400 responses"""
+        request = self._request(b'{"url": "https://localhost/test", "submitted_by": "Test User"}')
+        
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(parse_json_body(request, ArticleSubmission))
+        
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert exc_info.value.detail["error"]["code"] == "INVALID_INPUT"
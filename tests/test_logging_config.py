@@ -1,12 +1,17 @@
 """
 Tests for logging configuration
 """
+import gc
 import pytest
 import logging
+import io
 import json
 import tempfile
 import os
+import sys
+import weakref
 from pathlib import Path
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 from utils.logging_config import (
@@ -16,7 +21,8 @@ from utils.logging_config import (
     get_logger,
     log_operation,
     log_error,
-    init_logging
+    init_logging,
+    stop_log_listener
 )
 
 class TestJSONFormatter:
@@ -105,6 +111,97 @@ class TestJSONFormatter:
             assert "ValueError" in parsed["exception"]
             assert "Test exception" in parsed["exception"]
 
+    def test_json_formatter_reuses_cached_traceback(self):
+        """Test an already rendered traceback is emitted without reformatting"""
+        formatter = JSONFormatter()
+        
+        record = logging.LogRecord(
+            name="test.logger",
+            level=logging.ERROR,
+            pathname="test.py",
+            lineno=10,
+            msg="Test error",
+            args=(),
+            exc_info=None
+        )
+        record.exc_text = "Traceback (most recent call last):\nValueError: cached"
+        
+        with patch.object(formatter, "formatException") as mock_format_exception:
+            parsed = json.loads(formatter.format(record))
+        
+        mock_format_exception.assert_not_called()
+        assert parsed["exception"] == record.exc_text
+    
+    def test_json_formatter_reentrant(self):
+        """Test formatting a record whose message argument formats another record"""
+        formatter = JSONFormatter()
+        inner_outputs = []
+        
+        class LoggingArg:
+            def __str__(self):
+                inner = logging.LogRecord(
+                    name="inner.logger",
+                    level=logging.INFO,
+                    pathname="test.py",
+                    lineno=20,
+                    msg="Inner message",
+                    args=(),
+                    exc_info=None
+                )
+                inner_outputs.append(formatter.format(inner))
+                return "arg"
+        
+        record = logging.LogRecord(
+            name="outer.logger",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=10,
+            msg="Outer %s",
+            args=(LoggingArg(),),
+            exc_info=None
+        )
+        
+        parsed = json.loads(formatter.format(record))
+        inner_parsed = json.loads(inner_outputs[0])
+        
+        assert parsed["logger"] == "outer.logger"
+        assert parsed["message"] == "Outer arg"
+        assert parsed["line"] == 10
+        assert inner_parsed["logger"] == "inner.logger"
+        assert inner_parsed["message"] == "Inner message"
+    
+    def test_json_formatter_releases_exception_frames(self):
+        """Test the formatter does not keep a formatted record's traceback alive"""
+        formatter = JSONFormatter()
+        
+        class Resource:
+            pass
+        
+        def fail():
+            resource = Resource()
+            ref = weakref.ref(resource)
+            try:
+                raise ValueError("Test exception")
+            except ValueError:
+                return ref, sys.exc_info()
+        
+        ref, exc_info = fail()
+        record = logging.LogRecord(
+            name="test.logger",
+            level=logging.ERROR,
+            pathname="test.py",
+            lineno=10,
+            msg="Error occurred",
+            args=(),
+            exc_info=exc_info
+        )
+        
+        formatter.format(record)
+        del record, exc_info
+        gc.collect()
+        
+        assert ref() is None
+
 class TestColoredFormatter:
     """Test colored formatter"""
     
@@ -176,31 +273,83 @@ class TestLoggingSetup:
             mock_logger.setLevel.assert_called()
             mock_logger.addHandler.assert_called()
     
-    def test_setup_logging_with_file(self):
-        """Test logging setup with file output"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "test.log")
-            
-            setup_logging("INFO", log_file=log_file)
-            
-            # Log file should be created
-            assert os.path.exists(log_file)
-            
-            # Clean up handlers to release file
-            root_logger = logging.getLogger()
-            for handler in root_logger.handlers[:]:
-                handler.close()
-                root_logger.removeHandler(handler)
+    def test_setup_logging_with_stream(self):
+        """Test logging setup with stream output"""
+        log_stream = io.StringIO()
+        
+        setup_logging("INFO", log_stream=log_stream)
+        logging.getLogger("test.stream").info("Stream message")
+        stop_log_listener()
+        
+        output = log_stream.getvalue()
+        assert "test.stream - INFO - Stream message" in output
+        
+        # Clean up handlers
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            handler.close()
+            root_logger.removeHandler(handler)
     
     def test_setup_logging_with_json(self):
         """Test logging setup with JSON formatting"""
+        log_stream = io.StringIO()
+        
+        setup_logging("INFO", log_stream=log_stream, enable_json_logging=True)
+        logging.getLogger("test.json").info("JSON message")
+        stop_log_listener()
+        
+        entries = [json.loads(line) for line in log_stream.getvalue().splitlines()]
+        assert any(
+            entry["logger"] == "test.json" and entry["message"] == "JSON message"
+            for entry in entries
+        )
+        
+        # Clean up handlers
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            handler.close()
+            root_logger.removeHandler(handler)
+    
+    def test_setup_logging_json_timestamps_use_event_time(self):
+        """Test buffered JSON records keep the time they were logged, not the flush time"""
+        log_stream = io.StringIO()
+        
+        setup_logging("INFO", log_stream=log_stream, enable_json_logging=True)
+        logger = logging.getLogger("test.timestamps")
+        for message, created in (("First event", 1700000000.0), ("Second event", 1700000002.5)):
+            record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, message, None, None)
+            record.created = created
+            logger.handle(record)
+        stop_log_listener()
+        
+        entries = {
+            entry["message"]: entry["timestamp"]
+            for entry in map(json.loads, log_stream.getvalue().splitlines())
+            if entry["logger"] == "test.timestamps"
+        }
+        assert entries["First event"] == datetime.fromtimestamp(1700000000.0).astimezone().isoformat()
+        assert entries["Second event"] == datetime.fromtimestamp(1700000002.5).astimezone().isoformat()
+        assert entries["First event"] != entries["Second event"]
+        
+        # Clean up handlers
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            handler.close()
+            root_logger.removeHandler(handler)
+    
+    def test_setup_logging_flushes_buffered_records(self):
+        """Test buffered file records are written when the listener stops"""
         with tempfile.TemporaryDirectory() as temp_dir:
             log_file = os.path.join(temp_dir, "test.log")
             
             setup_logging("INFO", log_file=log_file, enable_json_logging=True)
+            logging.getLogger("test.buffered").info("Buffered message")
+            
+            stop_log_listener()
             
-            # Should create log file
-            assert os.path.exists(log_file)
+            with open(log_file, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            assert any(entry["message"] == "Buffered message" for entry in lines)
             
             # Clean up handlers to release file
             root_logger = logging.getLogger()
@@ -218,47 +367,43 @@ class TestLoggerUtilities:
         assert isinstance(logger, logging.Logger)
         assert logger.name == "test.module"
     
-    def test_log_operation(self):
+    def test_log_operation(self, caplog):
         """Test log_operation function"""
-        with patch('utils.logging_config.logging.getLogger') as mock_get_logger:
-            mock_logger = MagicMock()
-            mock_get_logger.return_value = mock_logger
-            
-            logger = get_logger("test")
-            log_operation(logger, "test_operation", 123.45, user_id="user123")
-            
-            # Should call logger.info with extra fields
-            mock_logger.info.assert_called_once()
-            args, kwargs = mock_logger.info.call_args
-            
-            assert "test_operation" in args[0]
-            assert "123.45ms" in args[0]
-            assert "extra" in kwargs
-            assert kwargs["extra"]["operation"] == "test_operation"
-            assert kwargs["extra"]["duration"] == 123.45
-            assert kwargs["extra"]["user_id"] == "user123"
+        caplog.set_level(logging.INFO, logger="test")
+        
+        logger = get_logger("test")
+        log_operation(logger, "test_operation", 123.45, user_id="user123")
+        
+        # Should log one INFO record with extra fields
+        assert len(caplog.records) == 1
+        record = caplog.records[0]
+        
+        assert record.levelno == logging.INFO
+        assert "test_operation" in record.getMessage()
+        assert "123.45ms" in record.getMessage()
+        assert record.operation == "test_operation"
+        assert record.duration == 123.45
+        assert record.user_id == "user123"
     
-    def test_log_error(self):
+    def test_log_error(self, caplog):
         """Test log_error function"""
-        with patch('utils.logging_config.logging.getLogger') as mock_get_logger:
-            mock_logger = MagicMock()
-            mock_get_logger.return_value = mock_logger
-            
-            logger = get_logger("test")
-            error = ValueError("Test error")
-            log_error(logger, error, operation="test_operation", user_id="user123")
-            
-            # Should call logger.error with exc_info and extra fields
-            mock_logger.error.assert_called_once()
-            args, kwargs = mock_logger.error.call_args
-            
-            assert "test_operation" in args[0]
-            assert "Test error" in args[0]
-            assert kwargs["exc_info"] is True
-            assert "extra" in kwargs
-            assert kwargs["extra"]["error_type"] == "ValueError"
-            assert kwargs["extra"]["operation"] == "test_operation"
-            assert kwargs["extra"]["user_id"] == "user123"
+        caplog.set_level(logging.ERROR, logger="test")
+        
+        logger = get_logger("test")
+        error = ValueError("Test error")
+        log_error(logger, error, operation="test_operation", user_id="user123")
+        
+        # Should log one ERROR record with exc_info and extra fields
+        assert len(caplog.records) == 1
+        record = caplog.records[0]
+        
+        assert record.levelno == logging.ERROR
+        assert "test_operation" in record.getMessage()
+        assert "Test error" in record.getMessage()
+        assert record.exc_info is not None
+        assert record.error_type == "ValueError"
+        assert record.operation == "test_operation"
+        assert record.user_id == "user123"
 
 class TestLoggingInitialization:
     """Test logging initialization"""
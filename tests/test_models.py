@@ -1,9 +1,11 @@
 """
 Unit tests for Pydantic models and validation
 """
+import json
 import pytest
 from pydantic import ValidationError
-from datetime import datetime
+from datetime import datetime, timezone
+from types import SimpleNamespace
 
 from schemas import ArticleSubmission, Article, ArticleResponse, PendingArticlesResponse
 from schemas import MediaReportRequest, HansardReportRequest, ReportResponse, ReportStatus
@@ -73,6 +75,89 @@ def test_article_model():
     assert article.submitted_by == "Test User"
     assert isinstance(article.timestamp, datetime)
 
+def test_article_from_row():
+    """Test Article built from a database row"""
+    row = SimpleNamespace(
+        id=1,
+        url="https://example.com/article",
+        pasted_text=None,
+        timestamp=datetime.utcnow(),
+        submitted_by="Test User"
+    )
+    
+    article = Article.from_row(row)
+    
+    assert article.id == 1
+    assert article.url == "https://example.com/article"
+    assert article.pasted_text is None
+    assert article.submitted_by == "Test User"
+    assert article.timestamp == row.timestamp.replace(tzinfo=timezone.utc)
+
+def test_article_timestamp_ns():
+    """Test Article stores its timestamp as nanoseconds since the epoch"""
+    article = Article(
+        url="https://example.com/article",
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        submitted_by="Test User"
+    )
+    
+    assert article.timestamp_ns == 1704067200 * 1_000_000_000
+    assert article.timestamp == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert article.model_dump()["timestamp_ns"] == article.timestamp_ns
+
+def test_article_timestamp_from_iso_string():
+    """Test Article coerces an ISO timestamp string instead of using the current time"""
+    article = Article.model_validate({
+        "url": "https://example.com/article",
+        "timestamp": "2024-01-01T00:00:00",
+        "submitted_by": "Test User"
+    })
+    
+    assert article.timestamp == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def test_article_invalid_timestamp():
+    """Test Article rejects a timestamp it cannot convert"""
+    with pytest.raises(ValidationError):
+        Article.model_validate({
+            "url": "https://example.com/article",
+            "timestamp": "not a date",
+            "submitted_by": "Test User"
+        })
+    
+    with pytest.raises(ValidationError):
+        Article.model_validate({
+            "url": "https://example.com/article",
+            "submitted_by": "Test User"
+        })
+
+def test_article_from_attributes():
+    """Test Article validated from an attribute object keeps the row's timestamp"""
+    row = SimpleNamespace(
+        id=1,
+        url="https://example.com/article",
+        pasted_text=None,
+        timestamp=datetime(2024, 1, 2, 12, 30),
+        submitted_by="Test User"
+    )
+    
+    article = Article.model_validate(row)
+    
+    assert article.id == 1
+    assert article.timestamp == datetime(2024, 1, 2, 12, 30, tzinfo=timezone.utc)
+
+def test_article_from_row_without_timestamp():
+    """Test Article.from_row rejects a row with no timestamp"""
+    row = SimpleNamespace(
+        id=1,
+        url="https://example.com/article",
+        pasted_text=None,
+        timestamp=None,
+        submitted_by="Test User"
+    )
+    
+    with pytest.raises(ValidationError):
+        Article.from_row(row)
+
 def test_article_response():
     """Test ArticleResponse model"""
     response = ArticleResponse(
@@ -109,6 +194,32 @@ def test_pending_articles_response():
     assert len(response.articles) == 2
     assert response.count == 2
 
+def test_pending_articles_json_response_render():
+    """Test the pending articles endpoint renders only the public article fields"""
+    from api.articles import PendingArticlesJSONResponse
+    
+    article = Article(
+        id=1,
+        url="https://example.com/article1",
+        pasted_text="x" * 1000,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        submitted_by="User 1"
+    )
+    content = PendingArticlesResponse(articles=[article], count=1)
+    
+    body = json.loads(PendingArticlesJSONResponse(content).body)
+    
+    assert body == {
+        "success": True,
+        "count": 1,
+        "articles": [{
+            "id": 1,
+            "url": "https://example.com/article1",
+            "submitted_by": "User 1",
+            "timestamp": "2024-01-01T00:00:00+00:00"
+        }]
+    }
+
 def test_media_report_request_valid():
     """Test valid media report request"""
     request = MediaReportRequest(
@@ -139,6 +250,15 @@ def test_media_report_request_too_long():
     
     assert "exceeds maximum length" in str(exc_info.value)
 
+def test_media_report_request_too_long_before_stripping():
+    """Test length limit applies to the content as submitted"""
+    padded_content = " " + "x" * 100000
+    
+    with pytest.raises(ValidationError) as exc_info:
+        MediaReportRequest(pasted_content=padded_content, recipient_email="user@example.com")
+    
+    assert "exceeds maximum length" in str(exc_info.value)
+
 def test_hansard_report_request():
     """Test HansardReportRequest model"""
     request = HansardReportRequest()
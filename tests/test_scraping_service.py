@@ -5,28 +5,59 @@ Tests cover normal operation, error scenarios, timeout handling,
 and content validation with mock websites.
 """
 
+import socket
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import requests
-from services.scraping_service import ScrapingService, ScrapingError
+from bs4 import BeautifulSoup
+from services.scraping_service import ScrapingService, ScrapingError, _SHARED_SESSION
+from utils import dns_cache
+
+
+@pytest.fixture(scope="module")
+def scraping_service():
+    """Scraping service shared by the unit tests in this module."""
+    return ScrapingService(timeout=5, max_retries=2, retry_delay=0.1)
+
+
+@pytest.fixture(autouse=True)
+def clear_scrape_cache(scraping_service):
+    """Keep cached scrape results and validators from leaking between tests on the shared service."""
+    yield
+    scraping_service._scrape_cache.clear()
+    scraping_service._conditional_cache.clear()
 
 
 class TestScrapingService:
     """Test cases for ScrapingService."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.service = ScrapingService(timeout=5, max_retries=2, retry_delay=0.1)
-    
     def test_init(self):
         """Test service initialization."""
         service = ScrapingService(timeout=10, max_retries=5, retry_delay=2.0)
         assert service.timeout == 10
         assert service.max_retries == 5
         assert service.retry_delay == 2.0
-        assert service.session is not None
+        assert service.max_concurrency == 8
+        assert service.session is _SHARED_SESSION
+    
+    def test_instances_share_connection_pool(self, scraping_service):
+        """Test that separate instances reuse one keep-alive pool per host."""
+        url = "https://example.com/article"
+        first = ScrapingService().session.get_adapter(url).poolmanager.connection_from_url(url)
+        second = ScrapingService().session.get_adapter(url).poolmanager.connection_from_url(url)
+        
+        assert first is second
+        assert 'Mozilla' in scraping_service.session.headers['User-Agent']
+    
+    def test_html_parser_prefers_lxml(self):
+        """Test that the C-backed lxml parser is used when installed."""
+        import services.scraping_service as scraping_module
+        expected = 'lxml' if scraping_module.LXML_AVAILABLE else 'html.parser'
+        assert scraping_module.HTML_PARSER == expected
     
-    def test_validate_url_valid(self):
+    def test_validate_url_valid(self, scraping_service):
         """Test URL validation with valid URLs."""
         valid_urls = [
             'https://example.com',
@@ -35,9 +66,9 @@ class TestScrapingService:
         ]
         
         for url in valid_urls:
-            assert self.service._validate_url(url) is True
+            assert scraping_service._validate_url(url) is True
     
-    def test_validate_url_invalid(self):
+    def test_validate_url_invalid(self, scraping_service):
         """Test URL validation with invalid URLs."""
         invalid_urls = [
             'not-a-url',
@@ -49,26 +80,26 @@ class TestScrapingService:
         ]
         
         for url in invalid_urls:
-            assert self.service._validate_url(url) is False
+            assert scraping_service._validate_url(url) is False
     
-    def test_clean_text(self):
+    def test_clean_text(self, scraping_service):
         """Test text cleaning functionality."""
         # Test whitespace normalization
         text = "  This   has    excessive   whitespace  "
-        cleaned = self.service._clean_text(text)
+        cleaned = scraping_service._clean_text(text)
         assert cleaned == "This has excessive whitespace"
         
         # Test line break normalization
         text = "Line 1\n\n\n\nLine 2"
-        cleaned = self.service._clean_text(text)
+        cleaned = scraping_service._clean_text(text)
         assert cleaned == "Line 1\n\nLine 2"
         
         # Test empty text
-        assert self.service._clean_text("") == ""
-        assert self.service._clean_text(None) == ""
+        assert scraping_service._clean_text("") == ""
+        assert scraping_service._clean_text(None) == ""
     
     @patch('services.scraping_service.Article')
-    def test_extract_with_newspaper_success(self, mock_article_class):
+    def test_extract_with_newspaper_success(self, mock_article_class, scraping_service):
         """Test successful content extraction with newspaper3k."""
         # Mock Article instance
         mock_article = Mock()
@@ -78,7 +109,7 @@ class TestScrapingService:
         mock_article.publish_date = "2024-01-15"
         mock_article_class.return_value = mock_article
         
-        result = self.service._extract_with_newspaper("https://example.com")
+        result = scraping_service._extract_with_newspaper("https://example.com")
         
         assert result is not None
         assert result['title'] == "Test Article Title"
@@ -90,26 +121,26 @@ class TestScrapingService:
         mock_article.parse.assert_called_once()
     
     @patch('services.scraping_service.Article')
-    def test_extract_with_newspaper_short_content(self, mock_article_class):
+    def test_extract_with_newspaper_short_content(self, mock_article_class, scraping_service):
         """Test newspaper3k extraction with content too short."""
         mock_article = Mock()
         mock_article.title = "Short"
         mock_article.text = "Too short"  # Less than 50 characters
         mock_article_class.return_value = mock_article
         
-        result = self.service._extract_with_newspaper("https://example.com")
+        result = scraping_service._extract_with_newspaper("https://example.com")
         assert result is None
     
     @patch('services.scraping_service.Article')
-    def test_extract_with_newspaper_exception(self, mock_article_class):
+    def test_extract_with_newspaper_exception(self, mock_article_class, scraping_service):
         """Test newspaper3k extraction with exception."""
         mock_article_class.side_effect = Exception("Download failed")
         
-        result = self.service._extract_with_newspaper("https://example.com")
+        result = scraping_service._extract_with_newspaper("https://example.com")
         assert result is None
     
     @patch('requests.Session.get')
-    def test_extract_with_beautifulsoup_success(self, mock_get):
+    def test_extract_with_beautifulsoup_success(self, mock_get, scraping_service):
         """Test successful content extraction with BeautifulSoup."""
         # Mock HTML response
         html_content = """
@@ -125,12 +156,12 @@ class TestScrapingService:
         </html>
         """
         
-        mock_response = Mock()
-        mock_response.content = html_content.encode('utf-8')
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.iter_content.return_value = [html_content.encode('utf-8')]
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
-        result = self.service._extract_with_beautifulsoup("https://example.com")
+        result = scraping_service._extract_with_beautifulsoup("https://example.com")
         
         assert result is not None
         assert result['title'] == "Test Article"
@@ -138,16 +169,65 @@ class TestScrapingService:
         assert result['authors'] == []
         assert result['publish_date'] is None
     
+    @patch('services.scraping_service.MAX_HTML_BYTES', 16)
+    @patch('requests.Session.get')
+    def test_extract_with_beautifulsoup_streams_capped_body(self, mock_get, scraping_service):
+        """Test that the body is streamed, cut off at the size cap and the response closed."""
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.iter_content.return_value = [b'a' * 10, b'b' * 10, b'c' * 10]
+        mock_get.return_value = mock_response
+        
+        html_bytes = scraping_service._read_html("https://example.com/big", mock_response)
+        result = scraping_service._extract_with_beautifulsoup("https://example.com/big")
+        
+        assert html_bytes == b'a' * 10 + b'b' * 10
+        assert result is None  # Too little content left to extract
+        assert mock_get.call_args.kwargs['stream'] is True
+        mock_response.close.assert_called_once()
+    
+    @patch('services.scraping_service.BeautifulSoup', wraps=BeautifulSoup)
+    @patch('requests.Session.get')
+    def test_extract_with_beautifulsoup_conditional_get(self, mock_get, mock_soup, scraping_service):
+        """Test that a 304 response reuses the parsed result without re-parsing."""
+        html_content = """
+        <html>
+            <head><title>Cached Article</title></head>
+            <body>
+                <article>
+                    <p>This article body is long enough to pass the minimum content length check.</p>
+                </article>
+            </body>
+        </html>
+        """
+        
+        first_response = Mock(status_code=200,
+                              headers={'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        first_response.iter_content.return_value = [html_content.encode('utf-8')]
+        not_modified = Mock(status_code=304, headers={})
+        mock_get.side_effect = [first_response, not_modified]
+        
+        first = scraping_service._extract_with_beautifulsoup("https://example.com/cached")
+        second = scraping_service._extract_with_beautifulsoup("https://example.com/cached")
+        
+        assert second == first
+        assert second['title'] == "Cached Article"
+        assert mock_soup.call_count == 1
+        assert mock_get.call_args_list[0].kwargs['headers'] == {}
+        assert mock_get.call_args_list[1].kwargs['headers'] == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        }
+    
     @patch('requests.Session.get')
-    def test_extract_with_beautifulsoup_http_error(self, mock_get):
+    def test_extract_with_beautifulsoup_http_error(self, mock_get, scraping_service):
         """Test BeautifulSoup extraction with HTTP error."""
         mock_get.side_effect = requests.exceptions.HTTPError("404 Not Found")
         
-        result = self.service._extract_with_beautifulsoup("https://example.com")
+        result = scraping_service._extract_with_beautifulsoup("https://example.com")
         assert result is None
     
     @patch.object(ScrapingService, '_extract_with_newspaper')
-    def test_scrape_article_success_newspaper(self, mock_newspaper):
+    def test_scrape_article_success_newspaper(self, mock_newspaper, scraping_service):
         """Test successful article scraping with newspaper3k."""
         mock_newspaper.return_value = {
             'title': 'Test Title',
@@ -156,7 +236,7 @@ class TestScrapingService:
             'publish_date': '2024-01-15'
         }
         
-        result = self.service.scrape_article("https://example.com/article")
+        result = scraping_service.scrape_article("https://example.com/article")
         
         assert result['success'] is True
         assert result['url'] == "https://example.com/article"
@@ -168,7 +248,7 @@ class TestScrapingService:
     
     @patch.object(ScrapingService, '_extract_with_newspaper')
     @patch.object(ScrapingService, '_extract_with_beautifulsoup')
-    def test_scrape_article_fallback_to_beautifulsoup(self, mock_bs, mock_newspaper):
+    def test_scrape_article_fallback_to_beautifulsoup(self, mock_bs, mock_newspaper, scraping_service):
         """Test fallback to BeautifulSoup when newspaper3k fails."""
         mock_newspaper.return_value = None
         mock_bs.return_value = {
@@ -178,7 +258,7 @@ class TestScrapingService:
             'publish_date': None
         }
         
-        result = self.service.scrape_article("https://example.com/article")
+        result = scraping_service.scrape_article("https://example.com/article")
         
         assert result['success'] is True
         assert result['title'] == 'BS Title'
@@ -186,9 +266,9 @@ class TestScrapingService:
         mock_newspaper.assert_called_once()
         mock_bs.assert_called_once()
     
-    def test_scrape_article_invalid_url(self):
+    def test_scrape_article_invalid_url(self, scraping_service):
         """Test scraping with invalid URL."""
-        result = self.service.scrape_article("invalid-url")
+        result = scraping_service.scrape_article("invalid-url")
         
         assert result['success'] is False
         assert result['error'] == 'Invalid URL format'
@@ -196,19 +276,19 @@ class TestScrapingService:
     
     @patch.object(ScrapingService, '_extract_with_newspaper')
     @patch.object(ScrapingService, '_extract_with_beautifulsoup')
-    def test_scrape_article_no_content_extracted(self, mock_bs, mock_newspaper):
+    def test_scrape_article_no_content_extracted(self, mock_bs, mock_newspaper, scraping_service):
         """Test scraping when no content can be extracted."""
         mock_newspaper.return_value = None
         mock_bs.return_value = None
         
-        result = self.service.scrape_article("https://example.com/article")
+        result = scraping_service.scrape_article("https://example.com/article")
         
         assert result['success'] is False
         assert result['error'] == "No content could be extracted"
     
     @patch.object(ScrapingService, '_extract_with_newspaper')
     @patch('time.sleep')  # Mock sleep to speed up tests
-    def test_scrape_article_timeout_with_retry(self, mock_sleep, mock_newspaper):
+    def test_scrape_article_timeout_with_retry(self, mock_sleep, mock_newspaper, scraping_service, monkeypatch):
         """Test scraping with timeout and retry logic."""
         mock_newspaper.side_effect = [
             requests.exceptions.Timeout("Timeout"),
@@ -222,8 +302,8 @@ class TestScrapingService:
         ]
         
         # Set max_retries to 3 for this test
-        self.service.max_retries = 3
-        result = self.service.scrape_article("https://example.com/article")
+        monkeypatch.setattr(scraping_service, "max_retries", 3)
+        result = scraping_service.scrape_article("https://example.com/article")
         
         assert result['success'] is True
         assert result['title'] == 'Success after retries'
@@ -232,72 +312,237 @@ class TestScrapingService:
     
     @patch.object(ScrapingService, '_extract_with_newspaper')
     @patch('time.sleep')
-    def test_scrape_article_max_retries_exceeded(self, mock_sleep, mock_newspaper):
+    def test_scrape_article_retry_backoff_grows(self, mock_sleep, mock_newspaper, scraping_service, monkeypatch):
+        """Test that retry delays back off exponentially and stay capped."""
+        mock_newspaper.side_effect = requests.exceptions.Timeout("Timeout")
+        monkeypatch.setattr(scraping_service, "max_retries", 4)
+        
+        scraping_service.scrape_article("https://example.com/article")
+        
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert len(delays) == 3
+        assert delays == sorted(delays)
+        assert scraping_service.retry_delay <= delays[0] <= scraping_service.retry_delay + 0.1
+        assert all(delay <= 30.0 for delay in delays)
+    
+    @patch.object(ScrapingService, '_extract_with_newspaper')
+    @patch('time.sleep')
+    def test_scrape_article_max_retries_exceeded(self, mock_sleep, mock_newspaper, scraping_service):
         """Test scraping when max retries are exceeded."""
         mock_newspaper.side_effect = requests.exceptions.Timeout("Timeout")
         
-        result = self.service.scrape_article("https://example.com/article")
+        result = scraping_service.scrape_article("https://example.com/article")
         
         assert result['success'] is False
         assert "Request timeout" in result['error']
-        assert mock_newspaper.call_count == self.service.max_retries
+        assert mock_newspaper.call_count == scraping_service.max_retries
     
     @patch.object(ScrapingService, '_extract_with_newspaper')
-    def test_scrape_article_http_4xx_no_retry(self, mock_newspaper):
+    def test_scrape_article_http_4xx_no_retry(self, mock_newspaper, scraping_service):
         """Test that 4xx HTTP errors don't trigger retries."""
         http_error = requests.exceptions.HTTPError("404 Not Found")
         http_error.response = Mock()
         http_error.response.status_code = 404
         mock_newspaper.side_effect = http_error
         
-        result = self.service.scrape_article("https://example.com/article")
+        result = scraping_service.scrape_article("https://example.com/article")
         
         assert result['success'] is False
         assert "HTTP error: 404" in result['error']
         assert mock_newspaper.call_count == 1  # No retries for 4xx
     
+    @patch.object(ScrapingService, '_extract_with_newspaper')
+    def test_scrape_article_reuses_cached_result(self, mock_newspaper, scraping_service):
+        """Test that a repeat scrape of the same article skips extraction."""
+        mock_newspaper.return_value = {
+            'title': 'Cached Article',
+            'text': 'This article content only needs to be extracted once per cache period.',
+            'authors': ['Author'],
+            'publish_date': None
+        }
+        
+        first = scraping_service.scrape_article("https://example.com/article#top")
+        second = scraping_service.scrape_article("HTTPS://EXAMPLE.COM/article")
+        
+        assert first['success'] is True
+        assert second['success'] is True
+        assert second['title'] == 'Cached Article'
+        assert second['url'] == "HTTPS://EXAMPLE.COM/article"
+        assert mock_newspaper.call_count == 1
+    
+    @patch.object(ScrapingService, '_extract_with_newspaper')
+    def test_scrape_article_refresh_bypasses_cache(self, mock_newspaper, scraping_service):
+        """Test that refresh=True scrapes again even when a result is cached."""
+        mock_newspaper.return_value = {
+            'title': 'Fresh Article',
+            'text': 'This article content is extracted again whenever a refresh is requested.',
+            'authors': [],
+            'publish_date': None
+        }
+        
+        scraping_service.scrape_article("https://example.com/article")
+        scraping_service.scrape_article("https://example.com/article", refresh=True)
+        
+        assert mock_newspaper.call_count == 2
+    
     @patch.object(ScrapingService, 'scrape_article')
-    @patch('time.sleep')
-    def test_batch_scrape_success(self, mock_sleep, mock_scrape):
+    def test_batch_scrape_success(self, mock_scrape, scraping_service):
         """Test successful batch scraping."""
         urls = [
             "https://example.com/article1",
             "https://example.com/article2",
             "https://example.com/article3"
         ]
+        results_by_url = {
+            urls[0]: {'success': True, 'url': urls[0], 'title': 'Article 1'},
+            urls[1]: {'success': True, 'url': urls[1], 'title': 'Article 2'},
+            urls[2]: {'success': False, 'url': urls[2], 'error': 'Failed'}
+        }
+        mock_scrape.side_effect = results_by_url.get
         
-        mock_scrape.side_effect = [
-            {'success': True, 'url': urls[0], 'title': 'Article 1'},
-            {'success': True, 'url': urls[1], 'title': 'Article 2'},
-            {'success': False, 'url': urls[2], 'error': 'Failed'}
-        ]
-        
-        results = self.service.batch_scrape(urls)
+        results = scraping_service.batch_scrape(urls)
         
         assert len(results) == 3
+        assert [r['url'] for r in results] == urls  # Order preserved
         assert results[0]['success'] is True
         assert results[1]['success'] is True
         assert results[2]['success'] is False
         assert mock_scrape.call_count == 3
-        assert mock_sleep.call_count == 2  # Sleep between requests
     
-    def test_batch_scrape_empty_list(self):
+    @patch.object(ScrapingService, 'scrape_article')
+    def test_batch_scrape_runs_concurrently(self, mock_scrape, scraping_service):
+        """Test that batch scraping dispatches every URL before any completes."""
+        urls = [f"https://example.com/article{i}" for i in range(3)]
+        # Each scrape blocks until all three are in flight; a sequential loop would break the barrier
+        barrier = threading.Barrier(len(urls), timeout=5)
+        
+        def scrape(url):
+            barrier.wait()
+            return {'success': True, 'url': url}
+        
+        mock_scrape.side_effect = scrape
+        
+        results = scraping_service.batch_scrape(urls)
+        
+        assert [r['url'] for r in results] == urls
+    
+    @patch.object(ScrapingService, 'scrape_article')
+    def test_batch_scrape_respects_max_concurrency(self, mock_scrape):
+        """Test that no more than max_concurrency scrapes run at once."""
+        service = ScrapingService(timeout=5, max_retries=1, retry_delay=0.1, max_concurrency=2)
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        
+        def scrape(url):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return {'success': True, 'url': url}
+        
+        mock_scrape.side_effect = scrape
+        
+        results = service.batch_scrape([f"https://example.com/article{i}" for i in range(6)])
+        
+        assert len(results) == 6
+        assert peak == 2
+    
+    def test_batch_scrape_empty_list(self, scraping_service):
         """Test batch scraping with empty URL list."""
-        results = self.service.batch_scrape([])
+        results = scraping_service.batch_scrape([])
         assert results == []
     
     @patch.object(ScrapingService, 'scrape_article')
-    def test_batch_scrape_single_url(self, mock_scrape):
+    def test_batch_scrape_single_url(self, mock_scrape, scraping_service):
         """Test batch scraping with single URL."""
         mock_scrape.return_value = {'success': True, 'url': 'https://example.com'}
         
-        results = self.service.batch_scrape(["https://example.com"])
+        results = scraping_service.batch_scrape(["https://example.com"])
         
         assert len(results) == 1
         assert results[0]['success'] is True
         mock_scrape.assert_called_once_with("https://example.com")
 
 
+class TestDNSCache:
+    """Test cases for the resolver cache used by ScrapingService."""
+    
+    def setup_method(self):
+        """Start each test with an installed, empty cache."""
+        dns_cache.install_dns_cache()
+        dns_cache.clear_dns_cache()
+    
+    def teardown_method(self):
+        """Restore the real resolver so other tests are unaffected."""
+        dns_cache.uninstall_dns_cache()
+    
+    def test_service_does_not_install_globally(self):
+        """Test that creating a service leaves process-wide lookups alone."""
+        dns_cache.uninstall_dns_cache()
+        
+        ScrapingService()
+        
+        assert socket.getaddrinfo is dns_cache._original_getaddrinfo
+    
+    def test_uninstall_restores_getaddrinfo(self):
+        """Test that uninstalling puts the original resolver back."""
+        assert socket.getaddrinfo is dns_cache._cached_getaddrinfo
+        
+        dns_cache.uninstall_dns_cache()
+        
+        assert socket.getaddrinfo is dns_cache._original_getaddrinfo
+    
+    @patch('utils.dns_cache._original_getaddrinfo')
+    def test_repeated_lookup_hits_cache(self, mock_resolve):
+        """Test that a second lookup of the same host skips the resolver."""
+        mock_resolve.return_value = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('93.184.216.34', 443))]
+        
+        with dns_cache.cached_resolution():
+            first = socket.getaddrinfo('example.com', 443)
+            second = socket.getaddrinfo('example.com', 443)
+        
+        assert first == second
+        assert mock_resolve.call_count == 1
+    
+    @patch('utils.dns_cache._original_getaddrinfo')
+    def test_lookup_outside_scope_is_not_cached(self, mock_resolve):
+        """Test that lookups outside a scraping request always hit the resolver."""
+        mock_resolve.return_value = []
+        
+        socket.getaddrinfo('smtp.example.com', 587)
+        socket.getaddrinfo('smtp.example.com', 587)
+        
+        assert mock_resolve.call_count == 2
+    
+    @patch('utils.dns_cache._original_getaddrinfo')
+    def test_expired_entry_is_resolved_again(self, mock_resolve):
+        """Test that answers are re-resolved once their TTL has passed."""
+        mock_resolve.return_value = []
+        
+        with patch('utils.dns_cache.DEFAULT_TTL_SECONDS', 0), dns_cache.cached_resolution():
+            socket.getaddrinfo('example.com', 443)
+            socket.getaddrinfo('example.com', 443)
+        
+        assert mock_resolve.call_count == 2
+    
+    @patch('utils.dns_cache._original_getaddrinfo')
+    def test_failures_are_not_cached(self, mock_resolve):
+        """Test that resolver errors propagate and are retried next time."""
+        mock_resolve.side_effect = socket.gaierror("Name or service not known")
+        
+        with dns_cache.cached_resolution():
+            for _ in range(2):
+                with pytest.raises(socket.gaierror):
+                    socket.getaddrinfo('missing.invalid', 443)
+        
+        assert mock_resolve.call_count == 2
+
+
+@pytest.mark.integration
 class TestScrapingServiceIntegration:
     """Integration tests for ScrapingService with real-like scenarios."""
     
@@ -326,8 +571,8 @@ class TestScrapingServiceIntegration:
         </html>
         """
         
-        mock_response = Mock()
-        mock_response.content = html_content.encode('utf-8')
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.iter_content.return_value = [html_content.encode('utf-8')]
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
@@ -18,7 +18,9 @@ from utils.security import (
     get_client_id,
     InvalidInputError,
     RateLimitExceeded,
-    SecurityError
+    SecurityError,
+    _client_id_cached,
+    _validate_url_cached
 )
 
 class TestURLValidator:
@@ -31,6 +33,18 @@ class TestURLValidator:
         assert sanitized == "http://example.com"
         assert error is None
     
+    def test_validate_url_is_memoized(self):
+        """Test that repeated validation of the same URL is served from the cache"""
+        _validate_url_cached.cache_clear()
+        
+        first = URLValidator.validate_url("http://example.com/cached")
+        second = URLValidator.validate_url("http://example.com/cached")
+        
+        assert first == second
+        info = _validate_url_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+    
     def test_valid_https_url(self):
         """Test valid HTTPS URL"""
         is_valid, sanitized, error = URLValidator.validate_url("https://example.com/path?query=value")
@@ -72,6 +86,13 @@ class TestURLValidator:
         assert is_valid is False
         assert "suspicious content" in error
     
+    def test_unlisted_scheme(self):
+        """Test non-HTTP scheme that matches no suspicious pattern"""
+        is_valid, sanitized, error = URLValidator.validate_url("Mailto:someone@example.com")
+        assert is_valid is False
+        assert sanitized == ""
+        assert error.startswith("URL scheme 'mailto' not allowed")
+    
     def test_javascript_scheme(self):
         """Test JavaScript scheme (security risk)"""
         is_valid, sanitized, error = URLValidator.validate_url("javascript:alert('xss')")
@@ -89,6 +110,7 @@ class TestURLValidator:
         is_valid, sanitized, error = URLValidator.validate_url("https://example.com/<script>alert('xss')</script>")
         assert is_valid is False
         assert "suspicious content" in error
+        assert error.endswith("<script")
     
     def test_long_url(self):
         """Test URL exceeding maximum length"""
@@ -177,9 +199,17 @@ class TestInputSanitizer:
 class TestRateLimiter:
     """Test rate limiting functionality"""
     
+    def test_rate_limiter_disabled_by_default(self):
+        """Test rate limiter allows everything while limiting is switched off"""
+        limiter = RateLimiter()
+        
+        for i in range(5):
+            is_allowed, info = limiter.is_allowed("client0", max_requests=1, window_seconds=60)
+            assert is_allowed is True
+    
     def test_rate_limiter_allows_requests(self):
         """Test rate limiter allows requests within limit"""
-        limiter = RateLimiter()
+        limiter = RateLimiter(enabled=True)
         
         # Should allow first request
         is_allowed, info = limiter.is_allowed("client1", max_requests=5, window_seconds=60)
@@ -193,7 +223,7 @@ class TestRateLimiter:
     
     def test_rate_limiter_blocks_excess_requests(self):
         """Test rate limiter blocks requests exceeding limit"""
-        limiter = RateLimiter()
+        limiter = RateLimiter(enabled=True)
         
         # Make requests up to limit
         for i in range(5):
@@ -207,7 +237,7 @@ class TestRateLimiter:
     
     def test_rate_limiter_different_clients(self):
         """Test rate limiter handles different clients separately"""
-        limiter = RateLimiter()
+        limiter = RateLimiter(enabled=True)
         
         # Client 1 makes requests
         for i in range(5):
@@ -219,9 +249,12 @@ class TestRateLimiter:
         assert is_allowed is True
         assert info["remaining"] == 4
     
-    def test_rate_limiter_window_expiry(self):
+    def test_rate_limiter_window_expiry(self, monkeypatch):
         """Test rate limiter window expiry"""
-        limiter = RateLimiter()
+        # Drive the limiter's monotonic clock by hand instead of sleeping
+        clock = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        limiter = RateLimiter(enabled=True)
         
         # Make requests up to limit
         for i in range(3):
@@ -232,8 +265,8 @@ class TestRateLimiter:
         is_allowed, info = limiter.is_allowed("client3", max_requests=3, window_seconds=1)
         assert is_allowed is False
         
-        # Wait for window to expire
-        time.sleep(1.1)
+        # Move past the window
+        clock[0] += 1.1
         
         # Should be allowed again
         is_allowed, info = limiter.is_allowed("client3", max_requests=3, window_seconds=1)
@@ -267,6 +300,12 @@ class TestCSRFProtection:
         assert CSRFProtection.validate_token("", "token") is False
         assert CSRFProtection.validate_token("token", "") is False
         assert CSRFProtection.validate_token("", "") is False
+    
+    def test_validate_token_non_ascii(self):
+        """Test token validation with non-ASCII input fails closed instead of raising"""
+        token = CSRFProtection.generate_token()
+        assert CSRFProtection.validate_token("tökén", token) is False
+        assert CSRFProtection.validate_token("tökén", "tökén") is True
 
 class TestSecurityHeaders:
     """Test security headers"""
@@ -371,6 +410,19 @@ class TestSecurityFunctions:
         assert "192.168.1.1:" in client_id
         assert len(client_id.split(":")) == 2
     
+    def test_get_client_id_is_memoized(self):
+        """Test repeated requests from the same client reuse the cached ID"""
+        _client_id_cached.cache_clear()
+        mock_request = Mock()
+        mock_request.client.host = "192.168.1.2"
+        mock_request.headers.get.return_value = "Mozilla/5.0"
+        
+        first = get_client_id(mock_request)
+        second = get_client_id(mock_request)
+        
+        assert first is second
+        assert _client_id_cached.cache_info().hits == 1
+    
     def test_get_client_id_no_client(self):
         """Test client ID generation with no client info"""
         mock_request = Mock()
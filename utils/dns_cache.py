@@ -0,0 +1,91 @@
+"""
+In-process DNS cache for outbound scraping requests
+"""
+import socket
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Resolver TTLs are not exposed by getaddrinfo, so cached answers live for a fixed time
+DEFAULT_TTL_SECONDS = 300.0
+MAX_ENTRIES = 1024
+
+_original_getaddrinfo = socket.getaddrinfo
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_lock = threading.Lock()
+_installed = False
+
+# Only lookups made inside cached_resolution() use the cache; everything else
+# in the process (SMTP, AI clients, database drivers) resolves normally
+_enabled: ContextVar[bool] = ContextVar('dns_cache_enabled', default=False)
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """Drop-in replacement for socket.getaddrinfo that reuses recent answers"""
+    if not _enabled.get():
+        return _original_getaddrinfo(host, port, family, type, proto, flags)
+    
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            addrinfo, expires_at = entry
+            if expires_at > now:
+                _cache.move_to_end(key)
+                return addrinfo
+            del _cache[key]
+
+    # Resolve outside the lock; failures propagate and are never cached
+    addrinfo = _original_getaddrinfo(host, port, family, type, proto, flags)
+
+    with _lock:
+        _cache[key] = (addrinfo, now + DEFAULT_TTL_SECONDS)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+    return addrinfo
+
+def install_dns_cache() -> None:
+    """Route socket.getaddrinfo through the cache; safe to call more than once"""
+    global _installed
+    with _lock:
+        if _installed:
+            return
+        socket.getaddrinfo = _cached_getaddrinfo
+        _installed = True
+    logger.debug("DNS cache installed")
+
+def uninstall_dns_cache() -> None:
+    """Restore the original socket.getaddrinfo and drop cached answers"""
+    global _installed
+    with _lock:
+        if not _installed:
+            return
+        if socket.getaddrinfo is _cached_getaddrinfo:
+            socket.getaddrinfo = _original_getaddrinfo
+        _installed = False
+        _cache.clear()
+    logger.debug("DNS cache uninstalled")
+
+@contextmanager
+def cached_resolution():
+    """Resolve hostnames through the cache for the duration of the block"""
+    install_dns_cache()
+    token = _enabled.set(True)
+    try:
+        yield
+    finally:
+        _enabled.reset(token)
+
+def clear_dns_cache() -> None:
+    """Forget all cached resolver answers"""
+    with _lock:
+        _cache.clear()
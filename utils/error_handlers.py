@@ -2,18 +2,21 @@
 Centralized error handling utilities and standardized error responses
 """
 import logging
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Type, TypeVar, Union
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 import traceback
 
 from utils.logging_config import get_logger, log_error
+from utils.security import InvalidInputError
 
 logger = get_logger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 class MediaMonitoringError(Exception):
     """Base exception class for Media Monitoring Agent"""
     
@@ -360,4 +363,56 @@ def safe_execute(func, *args, error_handler=None, operation: str = None, **kwarg
     except Exception as e:
         if error_handler:
             return error_handler(e)
-        raise handle_generic_error(e, operation or "operation")
\ No newline at end of file
+        raise handle_generic_error(e, operation or "operation")
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build the OpenAPI request body for routes that read their JSON body via parse_json_body
+    
+    Args:
+        model: Pydantic model describing the request body
+        
+    Returns:
+        Dictionary suitable for a route's openapi_extra argument
+    """
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+            "required": True
+        }
+    }
+
+async def parse_json_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """
+    Parse and validate a JSON request body in one pass with pydantic-core
+    
+    Args:
+        request: FastAPI request object
+        model: Pydantic model to validate the body against
+        
+    Returns:
+        Validated model instance
+        
+    Raises:
+        RequestValidationError: If the body is not valid JSON or fails validation
+        HTTPException: If a security check rejects the input
+    """
+    raw_body = await request.body()
+    try:
+        return model.model_validate_json(raw_body)
+    except ValidationError as e:
+        errors = [
+            {**err, "loc": ("body", *err["loc"])}
+            for err in e.errors(include_url=False)
+        ]
+        raise RequestValidationError(errors, body=raw_body)
+    except InvalidInputError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=create_error_response(
+                "INVALID_INPUT",
+                str(e),
+                status.HTTP_400_BAD_REQUEST,
+                request_id=getattr(request.state, 'request_id', None)
+            )
+        )
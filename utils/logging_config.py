@@ -1,46 +1,107 @@
 """
 Centralized logging configuration for the Media Monitoring Agent
 """
+import atexit
+import copy
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
-import json
+from typing import Dict, Optional, TextIO
+
+import orjson
 
 from config import settings
 
+# Interned exception class names reported by log_error
+_ERROR_TYPE_NAMES: Dict[type, str] = {}
+
+# Background listener that drains queued records into the buffered file handler
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+class _LogPayload:
+    """Fixed-schema container for a single structured log entry"""
+    
+    __slots__ = (
+        'timestamp', 'level', 'logger', 'message', 'module', 'function', 'line',
+        'user_id', 'request_id', 'operation', 'duration_ms', 'exception'
+    )
+
+class _LazyTraceback:
+    """Renders a record's traceback only when the JSON encoder asks for it"""
+    
+    __slots__ = ('formatter', 'record')
+    
+    def __init__(self, formatter: logging.Formatter, record: logging.LogRecord):
+        self.formatter = formatter
+        self.record = record
+    
+    def __str__(self):
+        # Cache on the record like logging.Formatter so other handlers can reuse it
+        record = self.record
+        if not record.exc_text:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+        return record.exc_text
+
+# Per-thread payload and entry dict reused across records by JSONFormatter
+_json_format_state = threading.local()
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
     def format(self, record):
         """Format log record as JSON"""
-        log_entry = {
-            "timestamp": datetime.now().astimezone().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno
-        }
+        state = _json_format_state
+        if getattr(state, 'busy', False):
+            # Re-entrant call (e.g. a message argument that logs) must not clobber the shared objects
+            return self._render(record, _LogPayload(), {})
+        
+        if not hasattr(state, 'payload'):
+            state.payload = _LogPayload()
+            state.log_entry = {}
+        
+        state.busy = True
+        try:
+            return self._render(record, state.payload, state.log_entry)
+        finally:
+            state.busy = False
+    
+    def _render(self, record, payload: _LogPayload, log_entry: dict) -> str:
+        """Fill the payload from the record and serialize its non-empty fields"""
+        # Use the event time, not the time a buffered record happens to be flushed
+        payload.timestamp = datetime.fromtimestamp(record.created).astimezone().isoformat()
+        payload.level = record.levelname
+        payload.logger = record.name
+        payload.message = record.getMessage()
+        payload.module = record.module
+        payload.function = record.funcName
+        payload.line = record.lineno
         
         # Add exception info if present
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
+        payload.exception = _LazyTraceback(self, record) if record.exc_info or record.exc_text else None
         
         # Add extra fields if present
-        if hasattr(record, 'user_id'):
-            log_entry["user_id"] = record.user_id
-        if hasattr(record, 'request_id'):
-            log_entry["request_id"] = record.request_id
-        if hasattr(record, 'operation'):
-            log_entry["operation"] = record.operation
-        if hasattr(record, 'duration'):
-            log_entry["duration_ms"] = record.duration
+        payload.user_id = getattr(record, 'user_id', None)
+        payload.request_id = getattr(record, 'request_id', None)
+        payload.operation = getattr(record, 'operation', None)
+        payload.duration_ms = getattr(record, 'duration', None)
         
-        return json.dumps(log_entry)
+        log_entry.clear()
+        for name in _LogPayload.__slots__:
+            value = getattr(payload, name)
+            if value is not None:
+                log_entry[name] = value
+        
+        try:
+            return orjson.dumps(log_entry, default=str).decode('utf-8')
+        finally:
+            # Don't keep the record (and its traceback frames) alive until the next one arrives
+            for name in _LogPayload.__slots__:
+                setattr(payload, name, None)
+            log_entry.clear()
 
 class ColoredFormatter(logging.Formatter):
     """Colored formatter for console output"""
@@ -54,16 +115,28 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    # Color code and padded level name per level number, assembled once at import
+    LEVEL_STYLES = {
+        logging.DEBUG: (COLORS['DEBUG'], f"{'DEBUG':8}"),
+        logging.INFO: (COLORS['INFO'], f"{'INFO':8}"),
+        logging.WARNING: (COLORS['WARNING'], f"{'WARNING':8}"),
+        logging.ERROR: (COLORS['ERROR'], f"{'ERROR':8}"),
+        logging.CRITICAL: (COLORS['CRITICAL'], f"{'CRITICAL':8}"),
+    }
+    
     def format(self, record):
         """Format log record with colors"""
-        color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
+        style = self.LEVEL_STYLES.get(record.levelno)
+        if style is None:
+            style = (self.COLORS['RESET'], f"{record.levelname:8}")
+        color, level = style
         reset = self.COLORS['RESET']
         
         # Format timestamp
         timestamp = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
         
         # Format the message
-        formatted_message = f"{color}[{timestamp}] {record.levelname:8} {record.name:20} | {record.getMessage()}{reset}"
+        formatted_message = f"{color}[{timestamp}] {level} {record.name:20} | {record.getMessage()}{reset}"
         
         # Add exception info if present
         if record.exc_info:
@@ -71,9 +144,38 @@ class ColoredFormatter(logging.Formatter):
         
         return formatted_message
 
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the handlers behind the listener"""
+    
+    def prepare(self, record):
+        """Merge message arguments but keep exception info for the target formatter"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def stop_log_listener() -> None:
+    """Stop the file logging listener and flush any buffered records"""
+    global _log_listener
+    
+    if _log_listener is None:
+        return
+    
+    listener = _log_listener
+    _log_listener = None
+    listener.stop()
+    for handler in listener.handlers:
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+
+atexit.register(stop_log_listener)
+
 def setup_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
+    log_stream: Optional[TextIO] = None,
     enable_json_logging: bool = False,
     max_file_size: int = 10 * 1024 * 1024,  # 10MB
     backup_count: int = 5
@@ -84,10 +186,13 @@ def setup_logging(
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (optional)
+        log_stream: Stream to receive file-style logs when no log file is given (optional)
         enable_json_logging: Whether to use JSON formatting for file logs
         max_file_size: Maximum size of log file before rotation
         backup_count: Number of backup files to keep
     """
+    global _log_listener
+    
     # Convert string level to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
     
@@ -101,6 +206,7 @@ def setup_logging(
     root_logger.setLevel(numeric_level)
     
     # Clear existing handlers
+    stop_log_listener()
     root_logger.handlers.clear()
     
     # Console handler with colored output
@@ -109,7 +215,8 @@ def setup_logging(
     console_handler.setFormatter(ColoredFormatter())
     root_logger.addHandler(console_handler)
     
-    # File handler with rotation if log file specified
+    # File handler with rotation if log file specified, otherwise a plain stream handler
+    file_handler = None
     if log_file:
         file_handler = logging.handlers.RotatingFileHandler(
             log_file,
@@ -117,6 +224,10 @@ def setup_logging(
             backupCount=backup_count,
             encoding='utf-8'
         )
+    elif log_stream is not None:
+        file_handler = logging.StreamHandler(log_stream)
+    
+    if file_handler is not None:
         file_handler.setLevel(numeric_level)
         
         if enable_json_logging:
@@ -128,7 +239,25 @@ def setup_logging(
                 )
             )
         
-        root_logger.addHandler(file_handler)
+        # Buffer records in memory and write them to disk in batches
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=256,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        buffered_handler.setLevel(numeric_level)
+        
+        # Hand records off to a background thread so callers never block on file I/O
+        log_queue = queue.SimpleQueue()
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, buffered_handler, respect_handler_level=True
+        )
+        _log_listener.start()
+        
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.setLevel(numeric_level)
+        root_logger.addHandler(queue_handler)
     
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -163,6 +292,10 @@ def log_operation(logger: logging.Logger, operation: str, duration_ms: Optional[
         duration_ms: Operation duration in milliseconds
         **kwargs: Additional fields to log
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    emit = logger.info
+    
     extra = {"operation": operation}
     if duration_ms is not None:
         extra["duration"] = duration_ms
@@ -172,7 +305,7 @@ def log_operation(logger: logging.Logger, operation: str, duration_ms: Optional[
     if duration_ms is not None:
         message += f" (took {duration_ms:.2f}ms)"
     
-    logger.info(message, extra=extra)
+    emit(message, extra=extra)
 
 def log_error(logger: logging.Logger, error: Exception, operation: str = None, **kwargs):
     """
@@ -184,7 +317,16 @@ def log_error(logger: logging.Logger, error: Exception, operation: str = None, *
         operation: Operation that failed (optional)
         **kwargs: Additional fields to log
     """
-    extra = {"error_type": type(error).__name__}
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    emit = logger.error
+    
+    error_class = type(error)
+    error_type = _ERROR_TYPE_NAMES.get(error_class)
+    if error_type is None:
+        error_type = _ERROR_TYPE_NAMES.setdefault(error_class, sys.intern(error_class.__name__))
+    
+    extra = {"error_type": error_type}
     if operation:
         extra["operation"] = operation
     extra.update(kwargs)
@@ -193,7 +335,7 @@ def log_error(logger: logging.Logger, error: Exception, operation: str = None, *
     if operation:
         message = f"Operation '{operation}' failed: {str(error)}"
     
-    logger.error(message, exc_info=True, extra=extra)
+    emit(message, exc_info=True, extra=extra)
 
 # Initialize logging on module import
 def init_logging():